@@ -105,7 +105,7 @@ def build_parser():
     parser.add_argument('--cudnn_benchmark', type=strtobool, default=True,
                         help='use CuDNN benchmark mode')
     parser.add_argument("--train_dtype", default="float32",
-                        choices=["float16", "float32", "float64", "O0", "O1", "O2", "O3"],
+                        choices=["float16", "bfloat16", "float32", "float64", "O0", "O1", "O2", "O3"],
                         help="Data type for training")
     parser.add_argument('--model_save_dir', type=str, default=False,
                         help='directory to save a model')
@@ -454,4 +454,8 @@ def build_parser():
                         help='delay threshold for MMA decoder')
     parser.add_argument('--recog_mem_len', type=int, default=0,
                         help='number of tokens for memory in TransformerXL decoder during evaluation')
+    parser.add_argument('--recog_lm_quantize', type=strtobool, default=False,
+                        help='apply dynamic int8 quantization to LMs for CPU decoding')
+    parser.add_argument('--recog_lm_fuse_embedding', type=strtobool, default=False,
+                        help='fuse the embedding and the 1st layer input projection of RNNLMs')
     return parser
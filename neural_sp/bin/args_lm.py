@@ -72,7 +72,7 @@ def build_parser():
     parser.add_argument('--cudnn_benchmark', type=strtobool, default=True,
                         help='use CuDNN benchmark mode')
     parser.add_argument("--train_dtype", default="float32",
-                        choices=["float16", "float32", "float64", "O0", "O1", "O2", "O3"],
+                        choices=["float16", "bfloat16", "float32", "float64", "O0", "O1", "O2", "O3"],
                         help="Data type for training")
     parser.add_argument('--model_save_dir', type=str, default=False,
                         help='directory to save a model')
@@ -15,6 +15,7 @@ import time
 
 from neural_sp.bin.args_asr import parse_args_eval
 from neural_sp.bin.eval_utils import average_checkpoints
+from neural_sp.bin.eval_utils import quantize_lm
 from neural_sp.bin.train_utils import (
     compute_subsampling_factor,
     load_checkpoint,
@@ -30,6 +31,7 @@ from neural_sp.evaluators.word import eval_word
 from neural_sp.evaluators.wordpiece import eval_wordpiece
 from neural_sp.evaluators.wordpiece_bleu import eval_wordpiece_bleu
 from neural_sp.models.lm.build import build_lm
+from neural_sp.models.lm.rnnlm import RNNLM
 from neural_sp.models.seq2seq.speech2text import Speech2Text
 
 logger = logging.getLogger(__name__)
@@ -98,6 +100,10 @@ def main():
                                   lm_dict_path=os.path.join(os.path.dirname(args.recog_lm), 'dict.txt'),
                                   asr_dict_path=os.path.join(dir_name, 'dict.txt'))
                     load_checkpoint(args.recog_lm, lm)
+                    if args.recog_lm_quantize and args.recog_n_gpus == 0:
+                        lm = quantize_lm(lm)
+                    elif args.recog_lm_fuse_embedding and isinstance(lm, RNNLM):
+                        lm.fuse_input_embedding()
                     if args_lm.backward:
                         model.lm_bwd = lm
                     else:
@@ -112,6 +118,10 @@ def main():
                     args_lm_second.recog_mem_len = args.recog_mem_len
                     lm_second = build_lm(args_lm_second)
                     load_checkpoint(args.recog_lm_second, lm_second)
+                    if args.recog_lm_quantize and args.recog_n_gpus == 0:
+                        lm_second = quantize_lm(lm_second)
+                    elif args.recog_lm_fuse_embedding and isinstance(lm_second, RNNLM):
+                        lm_second.fuse_input_embedding()
                     model.lm_second = lm_second
 
                 # second path (backward)
@@ -123,6 +133,10 @@ def main():
                     args_lm_bwd.recog_mem_len = args.recog_mem_len
                     lm_bwd = build_lm(args_lm_bwd)
                     load_checkpoint(args.recog_lm_bwd, lm_bwd)
+                    if args.recog_lm_quantize and args.recog_n_gpus == 0:
+                        lm_bwd = quantize_lm(lm_bwd)
+                    elif args.recog_lm_fuse_embedding and isinstance(lm_bwd, RNNLM):
+                        lm_bwd.fuse_input_embedding()
                     model.lm_bwd = lm_bwd
 
             if not args.recog_unit:
@@ -154,6 +168,8 @@ def main():
             logger.info('ASR decoder state carry over: %s' % (args.recog_asr_state_carry_over))
             logger.info('LM state carry over: %s' % (args.recog_lm_state_carry_over))
             logger.info('model average (Transformer): %d' % (args.recog_n_average))
+            logger.info('LM quantization (int8): %s' % (args.recog_lm_quantize and args.recog_n_gpus == 0))
+            logger.info('LM embedding fusion: %s' % args.recog_lm_fuse_embedding)
 
             # GPU setting
             if args.recog_n_gpus >= 1:
@@ -51,3 +51,29 @@ def average_checkpoints(model, best_model_path, n_average, topk_list=[]):
     torch.save(checkpoint_avg, checkpoint_avg_path)
 
     return model
+
+
+def quantize_lm(lm):
+    """Apply dynamic int8 quantization to a LM for CPU inference.
+
+    Weights in RNN and fully-connected layers are quantized, while the
+    embedding layer is kept in floating point.
+
+    Args:
+        lm (LMBase): LM on CPU
+    Returns:
+        lm (LMBase): quantized LM
+
+    """
+    if not (hasattr(torch.backends, 'quantized') and hasattr(torch, 'quantization')):
+        raise ValueError('--recog_lm_quantize requires torch>=1.3')
+    engines = torch.backends.quantized.supported_engines
+    if 'fbgemm' in engines:
+        torch.backends.quantized.engine = 'fbgemm'  # x86
+    elif 'qnnpack' in engines:
+        torch.backends.quantized.engine = 'qnnpack'  # ARM
+    lm = torch.quantization.quantize_dynamic(
+        lm.eval(), {torch.nn.LSTM, torch.nn.GRU, torch.nn.Linear}, dtype=torch.qint8)
+    logger.info('Quantize %s with %s (int8)' % (lm.__class__.__name__,
+                                                torch.backends.quantized.engine))
+    return lm
@@ -30,6 +30,7 @@ from neural_sp.evaluators.ppl import eval_ppl
 from neural_sp.models.data_parallel import CustomDataParallel
 from neural_sp.models.data_parallel import CPUWrapperLM
 from neural_sp.models.lm.build import build_lm
+from neural_sp.models.torch_utils import tensor2scalar
 from neural_sp.trainers.lr_scheduler import LRScheduler
 from neural_sp.trainers.optimizer import set_optimizer
 from neural_sp.trainers.reporter import Reporter
@@ -171,6 +172,22 @@ def main():
     # GPU setting
     use_apex = args.train_dtype in ["O0", "O1", "O2", "O3"]
     amp = None
+    use_native_amp = args.train_dtype in ["float16", "bfloat16"] and args.n_gpus >= 1
+    scaler = None
+    if use_native_amp:
+        if not hasattr(torch, 'autocast'):
+            raise ValueError('train_dtype=%s requires torch>=1.10.' % args.train_dtype)
+        if args.train_dtype == "bfloat16" and args.n_gpus > 1:
+            # NOTE: DataParallel replicas re-enter autocast with the default
+            # dtype (float16) because the autocast dtype is thread-local
+            raise ValueError('train_dtype=bfloat16 does not support n_gpus > 1.')
+        amp_dtype = torch.bfloat16 if args.train_dtype == "bfloat16" else torch.float16
+        if args.train_dtype == "float16":
+            if hasattr(torch.amp, 'GradScaler'):
+                scaler = torch.amp.GradScaler('cuda')
+            else:
+                scaler = torch.cuda.amp.GradScaler()
+            # NOTE: loss scaling is not necessary for bfloat16
     if args.n_gpus >= 1:
         model.cudnn_setting(deterministic=not (is_transformer or args.cudnn_benchmark),
                             benchmark=not is_transformer and args.cudnn_benchmark)
@@ -184,6 +201,8 @@ def main():
             amp.init()
             if args.resume:
                 load_checkpoint(args.resume, amp=amp)
+        elif scaler is not None and args.resume:
+            load_checkpoint(args.resume, amp=scaler)
         model = CustomDataParallel(model, device_ids=list(range(0, args.n_gpus)))
     else:
         model = CPUWrapperLM(model)
@@ -212,25 +231,33 @@ def main():
 
             if accum_n_steps == 1:
                 loss_train = 0  # moving average over gradient accumulation
-            loss, hidden, observation = model(ys_train, state=hidden)
+            if use_native_amp:
+                with torch.autocast(device_type='cuda', dtype=amp_dtype):
+                    loss, hidden, observation = model(ys_train, state=hidden)
+            else:
+                loss, hidden, observation = model(ys_train, state=hidden)
             loss = loss / accum_grad_n_steps
             reporter.add(observation)
             if use_apex:
                 with amp.scale_loss(loss, scheduler.optimizer) as scaled_loss:
                     scaled_loss.backward()
+            elif scaler is not None:
+                scaler.scale(loss).backward()
             else:
                 loss.backward()
             loss.detach()  # Truncate the graph
             if accum_n_steps >= accum_grad_n_steps or is_new_epoch:
                 if args.clip_grad_norm > 0:
+                    if scaler is not None:
+                        scaler.unscale_(scheduler.optimizer)
                     total_norm = torch.nn.utils.clip_grad_norm_(
                         model.module.parameters(), args.clip_grad_norm)
                     reporter.add_tensorboard_scalar('total_norm', total_norm)
-                scheduler.step()
+                scheduler.step(scaler)
                 scheduler.zero_grad()
                 accum_n_steps = 0
                 # NOTE: parameters are forcibly updated at the end of every epoch
-            loss_train += loss.item()
+            loss_train += loss.detach()
             del loss
             hidden = model.module.repackage_state(hidden)
 
@@ -253,7 +280,7 @@ def main():
                 duration_step = time.time() - start_time_step
                 logger.info("step:%d(ep:%.2f) loss:%.3f(%.3f)/lr:%.5f/bs:%d (%.2f min)" %
                             (n_steps, scheduler.n_epochs + train_set.epoch_detail,
-                             loss_train, loss_dev,
+                             tensor2scalar(loss_train), loss_dev,
                              scheduler.lr, ys_train.shape[0], duration_step / 60))
                 start_time_step = time.time()
 
@@ -276,7 +303,7 @@ def main():
 
             # Save the model
             scheduler.save_checkpoint(
-                model, save_path, remove_old=not is_transformer, amp=amp)
+                model, save_path, remove_old=not is_transformer, amp=amp if use_apex else scaler)
         else:
             start_time_eval = time.time()
             # dev
@@ -292,7 +319,7 @@ def main():
             if scheduler.is_topk or is_transformer:
                 # Save the model
                 scheduler.save_checkpoint(
-                    model, save_path, remove_old=not is_transformer, amp=amp)
+                    model, save_path, remove_old=not is_transformer, amp=amp if use_apex else scaler)
 
                 # test
                 ppl_test_avg = 0.
@@ -329,7 +356,7 @@ def main():
     duration_train = time.time() - start_time_train
     logger.info('Total time: %.2f hour' % (duration_train / 3600))
 
-    reporter.tf_writer.close()
+    reporter.close()
     pbar_epoch.close()
 
     return save_path
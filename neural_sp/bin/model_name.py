@@ -83,7 +83,7 @@ def set_asr_model_name(args):
     else:
         dir_name += '_lr' + str(args.lr)
     dir_name += '_bs' + str(args.batch_size)
-    if args.train_dtype in ["O0", "O1", "O2", "O3"]:
+    if args.train_dtype in ["O0", "O1", "O2", "O3", "bfloat16"]:
         dir_name += '_' + args.train_dtype
     # if args.shuffle_bucket:
     #     dir_name += '_bucket'
@@ -189,7 +189,7 @@ def set_lm_name(args):
     else:
         dir_name += '_lr' + str(args.lr)
     dir_name += '_bs' + str(args.batch_size)
-    if args.train_dtype in ["O0", "O1", "O2", "O3"]:
+    if args.train_dtype in ["O0", "O1", "O2", "O3", "bfloat16"]:
         dir_name += '_' + args.train_dtype
 
     dir_name += '_bptt' + str(args.bptt)
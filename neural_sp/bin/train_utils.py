@@ -5,6 +5,7 @@
 
 import codecs
 import functools
+import inspect
 import logging
 import numpy as np
 import os
@@ -12,6 +13,8 @@ import time
 import torch
 import yaml
 
+from neural_sp.trainers.optimizer import rebind_parameters
+
 logger = logging.getLogger(__name__)
 
 
@@ -134,13 +137,16 @@ def load_checkpoint(checkpoint_path, model=None, scheduler=None, amp=None):
         checkpoint_path (str): path to the saved model (model..epoch-*)
         model (torch.nn.Module):
         scheduler (LRScheduler): optimizer wrapped by LRScheduler class
-        amp ():
+        amp (): apex amp or GradScaler for native mixed precision training
     Returns:
         topk_list (list): list of (epoch, metric)
 
     """
     if os.path.isfile(checkpoint_path):
-        checkpoint = torch.load(checkpoint_path, map_location=lambda storage, loc: storage)
+        kwargs = {}
+        if 'weights_only' in inspect.signature(torch.load).parameters:
+            kwargs['weights_only'] = False  # the optimizer is pickled in the checkpoint
+        checkpoint = torch.load(checkpoint_path, map_location=lambda storage, loc: storage, **kwargs)
     else:
         raise ValueError("No checkpoint found at %s" % checkpoint_path)
 
@@ -157,14 +163,12 @@ def load_checkpoint(checkpoint_path, model=None, scheduler=None, amp=None):
     if scheduler is not None:
         scheduler.load_state_dict(checkpoint['optimizer_state_dict'])
         # NOTE: fix this later
-        scheduler.optimizer.param_groups[0]['params'] = []
-        for param_group in list(model.parameters()):
-            scheduler.optimizer.param_groups[0]['params'].append(param_group)
+        rebind_parameters(scheduler.optimizer, model)
     else:
         logger.warning('Scheduler/Optimizer is not loaded.')
 
     # Restore apex
-    if amp is not None:
+    if amp is not None and 'amp_state_dict' in checkpoint.keys():
         amp.load_state_dict(checkpoint['amp_state_dict'])
     else:
         logger.warning('amp is not loaded.')
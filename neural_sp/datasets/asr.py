@@ -610,8 +610,8 @@ class CustomBatchSampler(BatchSampler):
             self._offset += len(indices)
             is_new_epoch = (len(self.indices_buckets) == 0)
 
-            # Shuffle utterances in mini-batch
-            indices = random.sample(indices, len(indices))
+            # Sort utterances in mini-batch by input length
+            indices = self._sort_by_xlen(indices)
 
         else:
             if batch_size is None:
@@ -632,10 +632,18 @@ class CustomBatchSampler(BatchSampler):
                 self._offset = len(self.df)
                 is_new_epoch = True
 
-            # Shuffle utterances in mini-batch
-            indices = random.sample(indices, len(indices))
+            # Sort utterances in mini-batch by input length
+            indices = self._sort_by_xlen(indices)
 
             for i in indices:
                 self.indices.remove(i)
 
         return indices, is_new_epoch
+
+    def _sort_by_xlen(self, indices):
+        """Sort indices in the descending order of input length.
+
+        NOTE: the RNN encoder skips sorting for pack_padded_sequence if xlens are sorted.
+
+        """
+        return sorted(indices, key=lambda i: self.df['xlen'][i], reverse=True)
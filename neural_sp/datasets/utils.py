@@ -4,7 +4,9 @@
 """Utility functions for data loader."""
 
 import codecs
+import queue
 import random
+import threading
 
 random.seed(1)
 
@@ -63,3 +65,60 @@ def discourse_bucketing(df, batch_size):
                 indices_buckets.append(indices)
 
     return indices_buckets
+
+
+def prefetch(dataloader, batch_size=None, n_prefetch=2):
+    """Load mini-batches in a background thread until the end of the current epoch.
+
+    Args:
+        dataloader (CustomDataLoader): data loader
+        batch_size (int): size of mini-batch
+        n_prefetch (int): number of mini-batches loaded in advance
+    Yields:
+        mini_batch (dict):
+        is_new_epoch (bool): flag for the end of the current epoch
+
+    """
+    q = queue.Queue(maxsize=n_prefetch)
+    stop = threading.Event()
+
+    def _put(item):
+        # NOTE: give up once the consumer has stopped
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _load():
+        try:
+            while not stop.is_set():
+                batch, is_new_epoch = dataloader.next(batch_size)
+                _put((batch, is_new_epoch, None))
+                if is_new_epoch:
+                    break
+        except Exception as e:
+            _put((None, True, e))
+
+    thread = threading.Thread(target=_load, daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch, is_new_epoch, error = q.get()
+            if isinstance(error, StopIteration):
+                raise RuntimeError('The data loader has already finished all epochs.')
+            elif error is not None:
+                raise error
+            yield batch, is_new_epoch
+            if is_new_epoch:
+                break
+    finally:
+        # Stop the background thread before the caller touches the data loader again
+        stop.set()
+        while thread.is_alive():
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+            thread.join(timeout=0.1)
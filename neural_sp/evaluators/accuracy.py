@@ -37,7 +37,7 @@ def eval_accuracy(models, dataloader, batch_size=1, progressbar=False):
         _, observation = models[0](batch, task='all', is_eval=True)
         n_tokens_b = sum([len(y) for y in batch['ys']])
         _acc = observation.get('acc.att', observation.get('acc.att-sub1', 0))
-        total_acc += _acc * n_tokens_b
+        total_acc += float(_acc) * n_tokens_b
         n_tokens += n_tokens_b
 
         if progressbar:
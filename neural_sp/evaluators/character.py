@@ -4,14 +4,28 @@
 """Evaluate the character-level model by WER & CER."""
 
 import codecs
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor
+)
+from contextlib import closing
 import logging
+import multiprocessing
+import os
+import sys
 from tqdm import tqdm
 
+from neural_sp.datasets.utils import prefetch
 from neural_sp.evaluators.edit_distance import compute_wer
 from neural_sp.utils import mkdir_join
 
 logger = logging.getLogger(__name__)
 
+# for computing edit distance in worker processes
+MAX_WORKERS = 4
+MIN_UTTS_PARALLEL = 1000  # smaller sets are scored in-process
+_executor = None
+
 
 def eval_char(models, dataloader, recog_params, epoch,
               recog_dir=None, streaming=False, progressbar=False, task_idx=0):
@@ -69,10 +83,18 @@ def eval_char(models, dataloader, recog_params, epoch,
     elif task_idx == 3:
         task = 'ys_sub3'
 
-    with codecs.open(hyp_trn_path, 'w', encoding='utf-8') as f_hyp, \
-            codecs.open(ref_trn_path, 'w', encoding='utf-8') as f_ref:
-        while True:
-            batch, is_new_epoch = dataloader.next(recog_params['recog_batch_size'])
+    # Compute WER only for character units with word boundaries
+    compute_word_error = ('char' in dataloader.unit and 'nowb' not in dataloader.unit) or \
+        (task_idx > 0 and dataloader.unit_sub1 == 'char')
+
+    # NOTE: edit distance is computed in worker processes while the next mini-batch is decoded,
+    # and the next mini-batch is loaded in a background thread
+    executor = _get_executor() if len(dataloader) >= MIN_UTTS_PARALLEL else None
+    futures = []
+    with codecs.open(hyp_trn_path, 'w', encoding='utf-8', buffering=1 << 20) as f_hyp, \
+            codecs.open(ref_trn_path, 'w', encoding='utf-8', buffering=1 << 20) as f_ref, \
+            closing(prefetch(dataloader, recog_params['recog_batch_size'])) as batches:
+        for batch, is_new_epoch in batches:
             if streaming or recog_params['recog_chunk_sync']:
                 best_hyps_id, _ = models[0].decode_streaming(
                     batch['xs'], recog_params, dataloader.idx2token[0],
@@ -88,6 +110,8 @@ def eval_char(models, dataloader, recog_params, epoch,
                     task=task,
                     ensemble_models=models[1:] if len(models) > 1 else [])
 
+            hyp_lines, ref_lines = [], []
+            refs, hyps = [], []
             for b in range(len(batch['xs'])):
                 ref = batch['text'][b]
                 hyp = dataloader.idx2token[task_idx](best_hyps_id[b])
@@ -98,44 +122,24 @@ def eval_char(models, dataloader, recog_params, epoch,
                 if len(hyp) > 0 and hyp[-1] == ' ':
                     hyp = hyp[:-1]
 
-                # Write to trn
+                # Format trn lines
                 speaker = str(batch['speakers'][b]).replace('-', '_')
                 if streaming:
                     utt_id = str(batch['utt_ids'][b]) + '_0000000_0000001'
                 else:
                     utt_id = str(batch['utt_ids'][b])
-                f_ref.write(ref + ' (' + speaker + '-' + utt_id + ')\n')
-                f_hyp.write(hyp + ' (' + speaker + '-' + utt_id + ')\n')
-                logger.debug('utt-id: %s' % utt_id)
-                logger.debug('Ref: %s' % ref)
-                logger.debug('Hyp: %s' % hyp)
-                logger.debug('-' * 150)
+                trn_id = ' (%s-%s)\n' % (speaker, utt_id)
+                ref_lines.append(ref + trn_id)
+                hyp_lines.append(hyp + trn_id)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('utt-id: %s' % utt_id)
+                    logger.debug('Ref: %s' % ref)
+                    logger.debug('Hyp: %s' % hyp)
+                    logger.debug('-' * 150)
 
                 if not streaming:
-                    if ('char' in dataloader.unit and 'nowb' not in dataloader.unit) or (task_idx > 0 and dataloader.unit_sub1 == 'char'):
-                        # Compute WER
-                        wer_b, sub_b, ins_b, del_b = compute_wer(ref=ref.split(' '),
-                                                                 hyp=hyp.split(' '),
-                                                                 normalize=False)
-                        wer += wer_b
-                        n_sub_w += sub_b
-                        n_ins_w += ins_b
-                        n_del_w += del_b
-                        n_word += len(ref.split(' '))
-                        # NOTE: sentence error rate for Chinese
-
-                    # Compute CER
-                    if dataloader.corpus == 'csj':
-                        ref = ref.replace(' ', '')
-                        hyp = hyp.replace(' ', '')
-                    cer_b, sub_b, ins_b, del_b = compute_wer(ref=list(ref),
-                                                             hyp=list(hyp),
-                                                             normalize=False)
-                    cer += cer_b
-                    n_sub_c += sub_b
-                    n_ins_c += ins_b
-                    n_del_c += del_b
-                    n_char += len(ref)
+                    refs.append(ref)
+                    hyps.append(hyp)
                     if models[0].streamable():
                         n_streamable += 1
                     else:
@@ -146,8 +150,27 @@ def eval_char(models, dataloader, recog_params, epoch,
                 if progressbar:
                     pbar.update(1)
 
-            if is_new_epoch:
-                break
+            # Write to trn per mini-batch
+            f_ref.writelines(ref_lines)
+            f_hyp.writelines(hyp_lines)
+
+            if not streaming:
+                futures.append(_submit(executor, refs, hyps, compute_word_error,
+                                       remove_space=dataloader.corpus == 'csj'))
+
+        # Aggregate WER & CER over mini-batches
+        for future in futures:
+            errors = future.result()
+            wer += errors[0]
+            n_sub_w += errors[1]
+            n_ins_w += errors[2]
+            n_del_w += errors[3]
+            n_word += errors[4]
+            cer += errors[5]
+            n_sub_c += errors[6]
+            n_ins_c += errors[7]
+            n_del_c += errors[8]
+            n_char += errors[9]
 
     if progressbar:
         pbar.close()
@@ -156,7 +179,7 @@ def eval_char(models, dataloader, recog_params, epoch,
     dataloader.reset()
 
     if not streaming:
-        if ('char' in dataloader.unit and 'nowb' not in dataloader.unit) or (task_idx > 0 and dataloader.unit_sub1 == 'char'):
+        if compute_word_error:
             wer /= n_word
             n_sub_w /= n_word
             n_ins_w /= n_word
@@ -184,3 +207,86 @@ def eval_char(models, dataloader, recog_params, epoch,
     logger.info('Last success frame ratio (%s): %.2f %%' % (dataloader.set, last_success_frame_ratio))
 
     return wer, cer
+
+
+def _get_executor():
+    """Create a process pool once per run.
+
+    Workers are started with spawn rather than fork because the parent process
+    holds CUDA state and runs other threads such as the prefetcher.
+
+    Returns:
+        executor (ProcessPoolExecutor): `None` if not supported
+
+    """
+    global _executor
+    if _executor is None and sys.version_info >= (3, 7):
+        # NOTE: mp_context is supported since python 3.7
+        _executor = ProcessPoolExecutor(max_workers=min(MAX_WORKERS, os.cpu_count() or 1),
+                                        mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+
+def _submit(executor, refs, hyps, compute_word_error, remove_space=False):
+    """Compute WER & CER statistics of a mini-batch in a worker process if available.
+
+    Args:
+        executor (ProcessPoolExecutor): `None` to compute in-process
+        refs (list): reference transcripts
+        hyps (list): hypotheses
+        compute_word_error (bool): compute WER in addition to CER
+        remove_space (bool): remove spaces before computing CER
+    Returns:
+        future (Future): its result is the output of `_compute_errors`
+
+    """
+    if executor is not None:
+        return executor.submit(_compute_errors, refs, hyps, compute_word_error,
+                               remove_space=remove_space)
+    future = Future()
+    future.set_result(_compute_errors(refs, hyps, compute_word_error,
+                                      remove_space=remove_space))
+    return future
+
+
+def _compute_errors(refs, hyps, compute_word_error, remove_space=False):
+    """Compute WER & CER statistics of a mini-batch.
+
+    Args:
+        refs (list): reference transcripts
+        hyps (list): hypotheses
+        compute_word_error (bool): compute WER in addition to CER
+        remove_space (bool): remove spaces before computing CER
+    Returns:
+        errors (list): wer, n_sub_w, n_ins_w, n_del_w, n_word,
+            cer, n_sub_c, n_ins_c, n_del_c, n_char
+
+    """
+    errors = [0] * 10
+    for ref, hyp in zip(refs, hyps):
+        if compute_word_error:
+            # Compute WER
+            ref_words = ref.split(' ')
+            wer_b, sub_b, ins_b, del_b = compute_wer(ref=ref_words,
+                                                     hyp=hyp.split(' '),
+                                                     normalize=False)
+            errors[0] += wer_b
+            errors[1] += sub_b
+            errors[2] += ins_b
+            errors[3] += del_b
+            errors[4] += len(ref_words)
+            # NOTE: sentence error rate for Chinese
+
+        # Compute CER
+        if remove_space:
+            ref = ref.replace(' ', '')
+            hyp = hyp.replace(' ', '')
+        cer_b, sub_b, ins_b, del_b = compute_wer(ref=list(ref),
+                                                 hyp=list(hyp),
+                                                 normalize=False)
+        errors[5] += cer_b
+        errors[6] += sub_b
+        errors[7] += ins_b
+        errors[8] += del_b
+        errors[9] += len(ref)
+    return errors
@@ -61,7 +61,7 @@ def cross_entropy_lsm(logits, ys, lsm_prob, ignore_index, training, normalize_le
         normalize_length (bool): normalize XE loss by target sequence length
     Returns:
         loss_mean (FloatTensor): `[1]`
-        ppl (float): perplexity
+        ppl (FloatTensor): `[]`, perplexity
 
     """
     bs, _, vocab = logits.size()
@@ -71,7 +71,7 @@ def cross_entropy_lsm(logits, ys, lsm_prob, ignore_index, training, normalize_le
     if lsm_prob == 0 or not training:
         loss = F.cross_entropy(logits, ys,
                                ignore_index=ignore_index, reduction='mean')
-        ppl = np.exp(loss.item())
+        ppl = torch.exp(loss.detach())
         if not normalize_length:
             loss *= (ys != ignore_index).sum() / bs
     else:
@@ -84,11 +84,12 @@ def cross_entropy_lsm(logits, ys, lsm_prob, ignore_index, training, normalize_le
 
         log_probs = torch.log_softmax(logits, dim=-1)
         loss_sum = -torch.mul(target_dist, log_probs)
-        n_tokens = len(ys) - mask.sum().item()
+        n_tokens = len(ys) - mask.sum().float()
         denom = n_tokens if normalize_length else bs
         loss = loss_sum.masked_fill(mask.unsqueeze(1), 0).sum() / denom
 
-        ppl = np.exp(loss.item()) if normalize_length else np.exp(loss.item() * bs / n_tokens)
+        ppl = torch.exp(loss.detach()) if normalize_length else torch.exp(loss.detach() * bs / n_tokens)
+        # NOTE: keep on device to avoid a host-device synchronization per step
 
     return loss, ppl
 
@@ -3,6 +3,7 @@
 
 """Custom class for data parallel training."""
 
+import torch
 import torch.nn as nn
 from torch.nn import DataParallel
 from torch.nn.parallel import DistributedDataParallel as DDP
@@ -42,15 +43,36 @@ class CustomDataParallel(DataParallel):
     def gather(self, outputs, output_device):
         n_returns = len(outputs[0])
         assert n_returns == 2
-        n_gpus = len(outputs)
 
         losses = [output[0] for output in outputs]
-        observation_avg = {k: sum([output[1][k] for output in outputs]) / n_gpus
-                           for k, v in outputs[0][1].items() if v is not None}
+        observation_avg = average_observations([output[1] for output in outputs],
+                                               output_device)
 
         return gather(losses, output_device, dim=self.dim).mean(), observation_avg
 
 
+def average_observations(observations, device):
+    """Average observation dictionaries returned by each replica.
+
+    Args:
+        observations (List[dict]): observation of each replica.
+            Values are float or (0-dim) tensors placed on the replica's device
+        device (int or str or torch.device): output device
+    Returns:
+        observation_avg (dict): averaged observation
+
+    """
+    if isinstance(device, int):
+        device = torch.device('cpu') if device < 0 else torch.device('cuda', device)
+
+    def to_device(v):
+        return v.detach().to(device) if torch.is_tensor(v) else v
+
+    n_gpus = len(observations)
+    return {k: sum([to_device(obs[k]) for obs in observations]) / n_gpus
+            for k, v in observations[0].items() if v is not None}
+
+
 class CPUWrapperASR(nn.Module):
     def __init__(self, model):
         super(CPUWrapperASR, self).__init__()
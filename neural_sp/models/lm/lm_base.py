@@ -11,7 +11,6 @@ from neural_sp.models.base import ModelBase
 from neural_sp.models.criterion import cross_entropy_lsm
 from neural_sp.models.torch_utils import compute_accuracy
 from neural_sp.models.torch_utils import np2tensor
-from neural_sp.models.torch_utils import pad_list
 
 logger = logging.getLogger(__name__)
 
@@ -56,8 +55,14 @@ class LMBase(ModelBase):
         return loss, state, observation
 
     def _forward(self, ys, state, n_caches=0, predict_last=False):
-        ys = [np2tensor(y, self.device) for y in ys]  # <eos> is included
-        ys = pad_list(ys, self.pad)
+        # Pad on the host and transfer the whole mini-batch at once
+        if not isinstance(ys, np.ndarray):
+            ylens = [len(y) for y in ys]
+            ys_pad = np.full((len(ys), max(ylens)), self.pad, dtype=np.int64)
+            for b, y in enumerate(ys):
+                ys_pad[b, :ylens[b]] = y
+            ys = ys_pad
+        ys = np2tensor(ys, self.device)  # <eos> is included
         ys_in, ys_out = ys[:, :-1], ys[:, 1:]
 
         logits, out, new_state = self.decode(ys_in, state=state, mems=state)
@@ -104,7 +109,7 @@ class LMBase(ModelBase):
             else:
                 loss = self.adaptive_softmax(logits.view((-1, logits.size(2))),
                                              ys_out.contiguous().view(-1)).loss
-                ppl = np.exp(loss.item())
+                ppl = torch.exp(loss.detach())
 
         if n_caches > 0:
             # Register to cache
@@ -118,7 +123,8 @@ class LMBase(ModelBase):
             acc = compute_accuracy(self.adaptive_softmax.log_prob(
                 logits.view((-1, logits.size(2)))), ys_out, pad=self.pad)
 
-        observation = {'loss.lm': loss.item(), 'acc.lm': acc, 'ppl.lm': ppl}
+        observation = {'loss.lm': loss.detach(), 'acc.lm': acc, 'ppl.lm': ppl}
+        # NOTE: converted to scalars by Reporter to avoid a host-device synchronization per step
         return loss, new_state, observation
 
     def repackage_state(self, state):
@@ -10,6 +10,7 @@ from distutils.util import strtobool
 import logging
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 from neural_sp.models.lm.lm_base import LMBase
 from neural_sp.models.modules.glu import LinearGLUBlock
@@ -33,6 +34,9 @@ class RNNLM(LMBase):
         self.rnn_type = args.lm_type
         assert args.lm_type in ['lstm', 'gru']
         self.n_units = args.n_units
+        if args.n_units % 32 != 0:
+            logger.warning('n_units (%d) is not a multiple of 32, '
+                           'which prevents cuDNN from using its fastest RNN kernels.' % args.n_units)
         self.n_projs = args.n_projs
         self.n_layers = args.n_layers
         self.residual = args.residual
@@ -51,7 +55,11 @@ class RNNLM(LMBase):
         self.cache_keys = []
         self.cache_attn = []
 
-        self.embed = nn.Embedding(self.vocab, args.emb_dim, padding_idx=self.pad)
+        sparse_embedding = getattr(args, 'sparse_embedding', False)
+        if sparse_embedding:
+            assert not args.tie_embedding, 'sparse embedding cannot be tied with the output layer.'
+        self.embed = nn.Embedding(self.vocab, args.emb_dim, padding_idx=self.pad,
+                                  sparse=sparse_embedding)
         self.dropout_embed = nn.Dropout(p=args.dropout_in)
 
         rnn = nn.LSTM if args.lm_type == 'lstm' else nn.GRU
@@ -93,6 +101,10 @@ class RNNLM(LMBase):
 
         self.reset_parameters(args.param_init)
 
+        # for embedding fusion during inference
+        self.fuse_embedding = False
+        self._fused_W_ih0 = None
+
         # Initialize bias in forget gate with 1
         # self.init_forget_gate_bias_with_one()
 
@@ -112,6 +124,8 @@ class RNNLM(LMBase):
                            help='')
         group.add_argument('--use_glu', type=strtobool, default=False,
                            help='use Gated Linear Unit (GLU) for fully-connected layers')
+        group.add_argument('--sparse_embedding', type=strtobool, default=False,
+                           help='use sparse gradients for the embedding layer')
         return parser
 
     @staticmethod
@@ -131,6 +145,8 @@ class RNNLM(LMBase):
             dir_name += '_glu'
         if args.n_units_null_context > 0:
             dir_name += '_nullcv' + str(args.n_units_null_context)
+        if getattr(args, 'sparse_embedding', False):
+            dir_name += '_sparse'
         return dir_name
 
     def reset_parameters(self, param_init):
@@ -146,6 +162,55 @@ class RNNLM(LMBase):
             else:
                 raise ValueError(n)
 
+    def fuse_input_embedding(self):
+        """Fuse the embedding and the input-to-hidden projection of the 1st RNN layer
+            for step-by-step inference. Call this after training (not compatible with quantization).
+            The fused table of size `[vocab, n_gates * n_units]` is built lazily on the
+            device of the inputs.
+        """
+        assert isinstance(self.rnn[0], (nn.LSTM, nn.GRU))
+        self.fuse_embedding = True
+        self._fused_W_ih0 = None
+
+    def _fused_table(self, device):
+        if self._fused_W_ih0 is None or self._fused_W_ih0.device != device:
+            rnn = self.rnn[0]
+            with torch.no_grad():
+                # NOTE: the null context vector is always zero during inference
+                W_ih = rnn.weight_ih_l0[:, :self.emb_dim]
+                self._fused_W_ih0 = F.linear(self.embed.weight, W_ih, rnn.bias_ih_l0).to(device)
+        return self._fused_W_ih0
+
+    def _step_fused(self, ys, hx, cx=None):
+        """Single step of the 1st RNN layer with the fused input projection.
+
+        Args:
+            ys (LongTensor): `[B, 1]`
+            hx (FloatTensor): `[1, B, n_units]`
+            cx (FloatTensor): `[1, B, n_units]`
+        Returns:
+            out (FloatTensor): `[B, 1, n_units]`
+            hx (FloatTensor): `[1, B, n_units]`
+            cx (FloatTensor): `[1, B, n_units]`
+
+        """
+        rnn = self.rnn[0]
+        gi = F.embedding(ys[:, 0].long(), self._fused_table(ys.device))
+        gh = F.linear(hx[0], rnn.weight_hh_l0, rnn.bias_hh_l0)
+        if self.rnn_type == 'lstm':
+            i, f, g, o = (gi + gh).chunk(4, dim=-1)
+            c = torch.sigmoid(f) * cx[0] + torch.sigmoid(i) * torch.tanh(g)
+            h = torch.sigmoid(o) * torch.tanh(c)
+            cx = c.unsqueeze(0)
+        elif self.rnn_type == 'gru':
+            i_r, i_z, i_n = gi.chunk(3, dim=-1)
+            h_r, h_z, h_n = gh.chunk(3, dim=-1)
+            r = torch.sigmoid(i_r + h_r)
+            z = torch.sigmoid(i_z + h_z)
+            n = torch.tanh(i_n + r * h_n)
+            h = (1 - z) * n + z * hx[0]
+        return h.unsqueeze(1), h.unsqueeze(0), cx
+
     def decode(self, ys, state, mems=None, cache=None, incremental=False):
         """Decode function.
 
@@ -166,31 +231,45 @@ class RNNLM(LMBase):
 
         """
         bs, ymax = ys.size()
-        ys_emb = self.dropout_embed(self.embed(ys.long()))
+        if self.training:
+            self._fused_W_ih0 = None  # parameters will be updated
+        use_fused = self.fuse_embedding and not self.training and ymax == 1
+        if not use_fused:
+            ys_emb = self.embed(ys.long())
+            if self.training:
+                ys_emb = self.dropout_embed(ys_emb)
+            # NOTE: skip no-op dropout calls during step-by-step inference
 
         if state is None:
             state = self.zero_state(bs)
         new_state = {'hxs': None, 'cxs': None}
 
         # for ASR decoder pre-training
-        if self.n_units_cv > 0:
+        if self.n_units_cv > 0 and not use_fused:
             cv = ys.new_zeros(bs, ymax, self.n_units_cv).float()
             ys_emb = torch.cat([ys_emb, cv], dim=-1)
 
         residual = None
         new_hxs, new_cxs = [], []
         for lth in range(self.n_layers):
-            self.rnn[lth].flatten_parameters()  # for multi-GPUs
+            if ys.is_cuda:
+                self.rnn[lth].flatten_parameters()  # for multi-GPUs
 
             # Path through RNN
-            if self.rnn_type == 'lstm':
+            if use_fused and lth == 0:
+                ys_emb, h, c = self._step_fused(ys, state['hxs'][0:1],
+                                                state['cxs'][0:1] if self.rnn_type == 'lstm' else None)
+                if self.rnn_type == 'lstm':
+                    new_cxs.append(c)
+            elif self.rnn_type == 'lstm':
                 ys_emb, (h, c) = self.rnn[lth](ys_emb, hx=(state['hxs'][lth:lth + 1],
                                                            state['cxs'][lth:lth + 1]))
                 new_cxs.append(c)
             elif self.rnn_type == 'gru':
                 ys_emb, h = self.rnn[lth](ys_emb, hx=state['hxs'][lth:lth + 1])
             new_hxs.append(h)
-            ys_emb = self.dropout(ys_emb)
+            if self.training:
+                ys_emb = self.dropout(ys_emb)
             if self.n_projs > 0:
                 ys_emb = torch.tanh(self.proj[lth](ys_emb))
 
@@ -39,8 +39,8 @@ from neural_sp.models.torch_utils import (
     repeat,
     pad_list,
     np2tensor,
+    tensor2detach,
     tensor2np,
-    tensor2scalar,
 )
 
 
@@ -444,7 +444,7 @@ class RNNDecoder(DecoderBase):
             ctc_forced_align = (
                 'ctc_sync' in self.latency_metric and self.training) or self.attn_type == 'triggered_attention'
             loss_ctc, ctc_trigger_points = self.ctc(eouts, elens, ys, forced_align=ctc_forced_align)
-            observation['loss_ctc'] = tensor2scalar(loss_ctc)
+            observation['loss_ctc'] = tensor2detach(loss_ctc)
             if self.mtl_per_batch:
                 loss += loss_ctc
             else:
@@ -459,15 +459,15 @@ class RNNDecoder(DecoderBase):
             loss_att, acc_att, ppl_att, loss_quantity, loss_latency = self.forward_att(
                 eouts, elens, ys, teacher_logits=teacher_logits,
                 ctc_trigger_points=ctc_trigger_points, forced_trigger_points=trigger_points)
-            observation['loss_att'] = tensor2scalar(loss_att)
+            observation['loss_att'] = tensor2detach(loss_att)
             observation['acc_att'] = acc_att
             observation['ppl_att'] = ppl_att
             if self.attn_type == 'mocha':
                 if self._quantity_loss_weight > 0:
                     loss_att += loss_quantity * self._quantity_loss_weight
-                observation['loss_quantity'] = tensor2scalar(loss_quantity)
+                observation['loss_quantity'] = tensor2detach(loss_quantity)
             if self.latency_metric:
-                observation['loss_latency'] = tensor2scalar(loss_latency) if self.training else 0
+                observation['loss_latency'] = tensor2detach(loss_latency) if self.training else 0
                 if self.latency_loss_weight > 0:
                     loss_att += loss_latency * self.latency_loss_weight
             if self.mtl_per_batch:
@@ -540,10 +540,10 @@ class RNNDecoder(DecoderBase):
 
             # NOTE: MBR loss is accumlated over N-best and mini-batch
             loss = loss_mbr + loss_ce * self.mbr_ce_weight
-            observation['loss_mbr'] = tensor2scalar(loss_mbr)
-            observation['loss_att'] = tensor2scalar(loss_ce)
+            observation['loss_mbr'] = tensor2detach(loss_mbr)
+            observation['loss_att'] = tensor2detach(loss_ce)
 
-        observation['loss'] = tensor2scalar(loss)
+        observation['loss'] = tensor2detach(loss)
         return loss, observation
 
     def forward_mbr(self, eouts, elens, ys_hyp):
@@ -914,10 +914,11 @@ class RNNDecoder(DecoderBase):
         if self.attn_type == 'triggered_attention':
             assert trigger_points is not None
 
-        hyps_batch, aws_batch = [], []
-        ylens = torch.zeros(bs).int()
-        eos_flags = [False] * bs
+        aws_batch = []
+        ylens = eouts.new_zeros(bs, dtype=torch.int32)
+        eos_flags = eouts.new_zeros(bs, dtype=torch.uint8)
         ymax = math.ceil(xmax * max_len_ratio)
+        hyps_batch = eouts.new_zeros((bs, ymax), dtype=torch.int64)
         for i in range(ymax):
             # Update LM states for LM fusion
             if self.lm is not None:
@@ -932,21 +933,21 @@ class RNNDecoder(DecoderBase):
 
             # Pick up 1-best
             y = self.output(attn_v).argmax(-1)
-            hyps_batch += [y]
-
-            # Count lengths of hypotheses
-            for b in range(bs):
-                if not eos_flags[b]:
-                    if y[b].item() == self.eos:
-                        eos_flags[b] = True
-                        if self.discourse_aware:
-                            self.dstate_prev['hxs'][b] = dstates['dstate'][0][:, b:b + 1]
-                            if self.rnn_type == 'lstm':
-                                self.dstate_prev['cxs'][b] = dstates['dstate'][1][:, b:b + 1]
-                    ylens[b] += 1  # include <eos>
+            hyps_batch[:, i:i + 1] = y
+
+            # Count lengths of hypotheses (on device, to avoid per-utterance sync)
+            not_eos_flags = 1 - eos_flags
+            new_eos_flags = not_eos_flags * (y.squeeze(1) == self.eos).type_as(eos_flags)
+            ylens += not_eos_flags.int()  # include <eos>
+            eos_flags += new_eos_flags
+            if self.discourse_aware:
+                for b in torch.nonzero(new_eos_flags).squeeze(1).tolist():
+                    self.dstate_prev['hxs'][b] = dstates['dstate'][0][:, b:b + 1]
+                    if self.rnn_type == 'lstm':
+                        self.dstate_prev['cxs'][b] = dstates['dstate'][1][:, b:b + 1]
 
             # Break if <eos> is outputed in all mini-batch
-            if sum(eos_flags) == bs:
+            if bool(eos_flags.all()):
                 break
             if i == ymax - 1:
                 break
@@ -966,8 +967,10 @@ class RNNDecoder(DecoderBase):
         self.lmstate_final = lmstate
 
         # Concatenate in L dimension
-        hyps_batch = tensor2np(torch.cat(hyps_batch, dim=1))
+        hyps_batch = tensor2np(hyps_batch[:, :i + 1])
         aws_batch = tensor2np(torch.cat(aws_batch, dim=2))  # `[B, H, L, T]`
+        ylens = tensor2np(ylens)
+        eos_flags = tensor2np(eos_flags)
 
         # Truncate by the first <eos> (<sos> in case of the backward decoder)
         if self.bwd:
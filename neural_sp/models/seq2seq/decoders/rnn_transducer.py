@@ -19,8 +19,8 @@ from neural_sp.models.torch_utils import (
     np2tensor,
     pad_list,
     repeat,
-    tensor2np,
-    tensor2scalar
+    tensor2detach,
+    tensor2np
 )
 
 random.seed(1)
@@ -201,7 +201,7 @@ class RNNTransducer(DecoderBase):
         # CTC loss
         if self.ctc_weight > 0 and (task == 'all' or 'ctc' in task):
             loss_ctc, _ = self.ctc(eouts, elens, ys)
-            observation['loss_ctc'] = tensor2scalar(loss_ctc)
+            observation['loss_ctc'] = tensor2detach(loss_ctc)
             if self.mtl_per_batch:
                 loss += loss_ctc
             else:
@@ -210,13 +210,13 @@ class RNNTransducer(DecoderBase):
         # RNN-T loss
         if self.rnnt_weight > 0 and (task == 'all' or 'ctc' not in task):
             loss_transducer = self.forward_transducer(eouts, elens, ys)
-            observation['loss_transducer'] = tensor2scalar(loss_transducer)
+            observation['loss_transducer'] = tensor2detach(loss_transducer)
             if self.mtl_per_batch:
                 loss += loss_transducer
             else:
                 loss += loss_transducer * self.rnnt_weight
 
-        observation['loss'] = tensor2scalar(loss)
+        observation['loss'] = tensor2detach(loss)
         return loss, observation
 
     def forward_transducer(self, eouts, elens, ys):
@@ -26,8 +26,8 @@ from neural_sp.models.torch_utils import (
     append_sos_eos,
     compute_accuracy,
     make_pad_mask,
-    tensor2np,
-    tensor2scalar
+    tensor2detach,
+    tensor2np
 )
 
 random.seed(1)
@@ -335,7 +335,7 @@ class TransformerDecoder(DecoderBase):
         if self.ctc_weight > 0 and (task == 'all' or 'ctc' in task):
             ctc_forced_align = (self.ctc_trigger and self.training) or self.attn_type == 'triggered_attention'
             loss_ctc, trigger_points = self.ctc(eouts, elens, ys, forced_align=ctc_forced_align)
-            observation['loss_ctc'] = tensor2scalar(loss_ctc)
+            observation['loss_ctc'] = tensor2detach(loss_ctc)
             if self.mtl_per_batch:
                 loss += loss_ctc
             else:
@@ -345,18 +345,18 @@ class TransformerDecoder(DecoderBase):
         if self.att_weight > 0 and (task == 'all' or 'ctc' not in task):
             loss_att, acc_att, ppl_att, losses_auxiliary = self.forward_att(
                 eouts, elens, ys, trigger_points=trigger_points)
-            observation['loss_att'] = tensor2scalar(loss_att)
+            observation['loss_att'] = tensor2detach(loss_att)
             observation['acc_att'] = acc_att
             observation['ppl_att'] = ppl_att
             if self.attn_type == 'mocha':
                 if self._quantity_loss_weight > 0:
                     loss_att += losses_auxiliary['loss_quantity'] * self._quantity_loss_weight
-                observation['loss_quantity'] = tensor2scalar(losses_auxiliary['loss_quantity'])
+                observation['loss_quantity'] = tensor2detach(losses_auxiliary['loss_quantity'])
             if self.headdiv_loss_weight > 0:
                 loss_att += losses_auxiliary['loss_headdiv'] * self.headdiv_loss_weight
-                observation['loss_headdiv'] = tensor2scalar(losses_auxiliary['loss_headdiv'])
+                observation['loss_headdiv'] = tensor2detach(losses_auxiliary['loss_headdiv'])
             if self.latency_metric:
-                observation['loss_latency'] = tensor2scalar(losses_auxiliary['loss_latency']) if self.training else 0
+                observation['loss_latency'] = tensor2detach(losses_auxiliary['loss_latency']) if self.training else 0
                 if self.latency_metric != 'decot' and self.latency_loss_weight > 0:
                     loss_att += losses_auxiliary['loss_latency'] * self.latency_loss_weight
             if self.mtl_per_batch:
@@ -364,7 +364,7 @@ class TransformerDecoder(DecoderBase):
             else:
                 loss += loss_att * self.att_weight
 
-        observation['loss'] = tensor2scalar(loss)
+        observation['loss'] = tensor2detach(loss)
         return loss, observation
 
     def forward_att(self, eouts, elens, ys, trigger_points=None):
@@ -475,22 +475,23 @@ class TransformerDecoder(DecoderBase):
 
         """
         bs, xmax = eouts.size()[:2]
-        ys = eouts.new_zeros((bs, 1), dtype=torch.int64).fill_(self.eos)
+        ymax = math.ceil(xmax * max_len_ratio)
+        ys = eouts.new_zeros((bs, ymax + 1), dtype=torch.int64)
+        ys[:, 0] = self.eos
+        # NOTE: ys[:, 1:] is filled with hypotheses step by step
 
         cache = [None] * self.n_layers
 
-        hyps_batch = []
-        ylens = torch.zeros(bs).int()
-        eos_flags = [False] * bs
+        ylens = eouts.new_zeros(bs, dtype=torch.int32)
+        eos_flags = eouts.new_zeros(bs, dtype=torch.uint8)
         xy_aws_layers_steps = []
-        ymax = math.ceil(xmax * max_len_ratio)
         for i in range(ymax):
             causal_mask = eouts.new_ones(i + 1, i + 1).byte()
             causal_mask = torch.tril(causal_mask, out=causal_mask).unsqueeze(0).repeat([bs, 1, 1])
 
             new_cache = [None] * self.n_layers
             xy_aws_layers = []
-            out = self.pos_enc(self.embed(ys))  # scaled + dropout
+            out = self.pos_enc(self.embed(ys[:, :i + 1]))  # scaled + dropout
             for lth, layer in enumerate(self.layers):
                 out = layer(out, causal_mask, eouts, None, cache=cache[lth])
                 new_cache[lth] = out
@@ -502,29 +503,27 @@ class TransformerDecoder(DecoderBase):
 
             # Pick up 1-best
             y = self.output(self.norm_out(out))[:, -1:].argmax(-1)
-            hyps_batch += [y]
+            ys[:, i + 1:i + 2] = y
             xy_aws_layers = torch.stack(xy_aws_layers, dim=2)  # `[B, H, n_layers, 1, T]`
             xy_aws_layers_steps.append(xy_aws_layers)
 
-            # Count lengths of hypotheses
-            for b in range(bs):
-                if not eos_flags[b]:
-                    if y[b].item() == self.eos:
-                        eos_flags[b] = True
-                    ylens[b] += 1  # include <eos>
+            # Count lengths of hypotheses (on device, to avoid per-utterance sync)
+            not_eos_flags = 1 - eos_flags
+            ylens += not_eos_flags.int()  # include <eos>
+            eos_flags += not_eos_flags * (y.squeeze(1) == self.eos).type_as(eos_flags)
 
             # Break if <eos> is outputed in all mini-batch
-            if sum(eos_flags) == bs:
+            if bool(eos_flags.all()):
                 break
             if i == ymax - 1:
                 break
 
-            ys = torch.cat([ys, y], dim=-1)
-
         # Concatenate in L dimension
-        hyps_batch = tensor2np(torch.cat(hyps_batch, dim=1))
+        hyps_batch = tensor2np(ys[:, 1:i + 2])
+        ylens = tensor2np(ylens)
+        eos_flags = tensor2np(eos_flags)
         xy_aws_layers_steps = torch.cat(xy_aws_layers_steps, dim=-2)  # `[B, H, n_layers, L, T]`
-        xy_aws_layers_steps = xy_aws_layers_steps.view(bs, self.n_heads * self.n_layers, ys.size(1), xmax)
+        xy_aws_layers_steps = xy_aws_layers_steps.view(bs, self.n_heads * self.n_layers, i + 1, xmax)
         xy_aws = tensor2np(xy_aws_layers_steps)
 
         # Truncate by the first <eos> (<sos> in case of the backward decoder)
@@ -23,6 +23,7 @@ from neural_sp.models.seq2seq.encoders.subsampling import (
     DropSubsampler,
     MaxpoolSubsampler
 )
+from neural_sp.models.torch_utils import make_pad_mask
 
 
 logger = logging.getLogger(__name__)
@@ -285,10 +286,14 @@ class RNNEncoder(EncoderBase):
                  'ys_sub2': {'xs': None, 'xlens': None}}
 
         # Sort by lengths in the descending order for pack_padded_sequence
+        perm_ids_unsort = None
         if not self.lc_bidir:
-            xlens, perm_ids = torch.IntTensor(xlens).sort(0, descending=True)
-            xs = xs[perm_ids]
-            _, perm_ids_unsort = perm_ids.sort()
+            xlens = torch.IntTensor(xlens)
+            # NOTE: mini-batches are already sorted by CustomBatchSampler
+            if not bool((xlens[:-1] >= xlens[1:]).all()):
+                xlens, perm_ids = xlens.sort(0, descending=True)
+                xs = xs[perm_ids]
+                _, perm_ids_unsort = perm_ids.sort()
 
         # Dropout for inputs-hidden connection
         xs = self.dropout_in(xs)
@@ -355,7 +360,7 @@ class RNNEncoder(EncoderBase):
             xs = self.bridge(xs)
 
         if task in ['all', 'ys']:
-            if not self.lc_bidir:
+            if perm_ids_unsort is not None:
                 xs = xs[perm_ids_unsort]
                 xlens = xlens[perm_ids_unsort]
             eouts['ys']['xs'], eouts['ys']['xlens'] = xs, xlens
@@ -491,8 +496,11 @@ class RNNEncoder(EncoderBase):
             xs_sub = xs.clone()
         if getattr(self, 'bridge_' + module) is not None:
             xs_sub = getattr(self, 'bridge_' + module)(xs_sub)
-        xs_sub = xs_sub[perm_ids_unsort]
-        xlens_sub = xlens[perm_ids_unsort]
+        if perm_ids_unsort is not None:
+            xs_sub = xs_sub[perm_ids_unsort]
+            xlens_sub = xlens[perm_ids_unsort]
+        else:
+            xlens_sub = xlens.clone()
         return xs_sub, xlens_sub
 
 
@@ -505,9 +513,19 @@ class Padding(nn.Module):
 
     def forward(self, xs, xlens, rnn, prev_state=None, streaming=False):
         if not streaming and xlens is not None:
-            xs = pack_padded_sequence(xs, xlens.tolist(), batch_first=True)
-            xs, state = rnn(xs, hx=prev_state)
-            xs = pad_packed_sequence(xs, batch_first=True)[0]
+            xmax, xmin = xlens.max().item(), xlens.min().item()
+            if xmax == xmin or (not rnn.bidirectional and xmax - xmin < xmax * 0.2):
+                # Packing is much slower than padded execution and is not necessary
+                # when lengths are (almost) uniform. Outputs at valid frames are
+                # identical to the packed ones for unidirectional RNNs.
+                xs, state = rnn(xs[:, :xmax].contiguous(), hx=prev_state)
+                if xmax != xmin:
+                    mask = make_pad_mask(xlens.to(xs.device)).unsqueeze(2)
+                    xs = xs.masked_fill(~mask, 0)
+            else:
+                xs = pack_padded_sequence(xs, xlens.tolist(), batch_first=True)
+                xs, state = rnn(xs, hx=prev_state)
+                xs = pad_packed_sequence(xs, batch_first=True)[0]
         else:
             xs, state = rnn(xs, hx=prev_state)
 
@@ -40,6 +40,20 @@ def tensor2scalar(x):
     return x.cpu().detach().item()
 
 
+def tensor2detach(x):
+    """Detach torch.Tensor from the graph without a host-device synchronization.
+
+    Args:
+        x (torch.Tensor):
+    Returns:
+        x (torch.Tensor): detached tensor, which is converted to a scalar value by Reporter
+
+    """
+    if isinstance(x, float):
+        return x
+    return x.detach()
+
+
 def np2tensor(array, device=None):
     """Convert form np.ndarray to torch.Tensor.
 
@@ -111,18 +125,26 @@ def append_sos_eos(ys, sos, eos, pad, device, bwd=False, replace_sos=False):
         ylens (IntTensor): `[B]`
 
     """
-    _eos = torch.zeros(1, dtype=torch.int64, device=device).fill_(eos)
-    ys = [np2tensor(np.fromiter(y[::-1] if bwd else y, dtype=np.int64),
-                    device) for y in ys]
+    ys = [np.fromiter(y[::-1] if bwd else y, dtype=np.int64) for y in ys]
     if replace_sos:
-        ylens = np2tensor(np.fromiter([y[1:].size(0) + 1 for y in ys], dtype=np.int32))  # +1 for <eos>
-        ys_in = pad_list([y for y in ys], pad)
-        ys_out = pad_list([torch.cat([y[1:], _eos], dim=0) for y in ys], pad)
+        ylens = np.fromiter([len(y[1:]) + 1 for y in ys], dtype=np.int32)  # +1 for <eos>
     else:
-        _sos = torch.zeros(1, dtype=torch.int64, device=device).fill_(sos)
-        ylens = np2tensor(np.fromiter([y.size(0) + 1 for y in ys], dtype=np.int32))  # +1 for <eos>
-        ys_in = pad_list([torch.cat([_sos, y], dim=0) for y in ys], pad)
-        ys_out = pad_list([torch.cat([y, _eos], dim=0) for y in ys], pad)
+        ylens = np.fromiter([len(y) + 1 for y in ys], dtype=np.int32)  # +1 for <eos>
+
+    # Pad on the host and transfer ys_in and ys_out at once
+    ys_pad = np.full((2, len(ys), ylens.max()), pad, dtype=np.int64)
+    for b, y in enumerate(ys):
+        if replace_sos:
+            ys_pad[0, b, :len(y)] = y
+            ys_pad[1, b, :ylens[b] - 1] = y[1:]
+        else:
+            ys_pad[0, b, 0] = sos
+            ys_pad[0, b, 1:ylens[b]] = y
+            ys_pad[1, b, :ylens[b] - 1] = y
+        ys_pad[1, b, ylens[b] - 1] = eos
+    ys_pad = np2tensor(ys_pad, device)
+    ys_in, ys_out = ys_pad[0], ys_pad[1]
+    ylens = np2tensor(ylens)
     return ys_in, ys_out, ylens
 
 
@@ -134,12 +156,13 @@ def compute_accuracy(logits, ys_ref, pad):
         ys_ref (LongTensor): `[B, T]`
         pad (int): index for padding
     Returns:
-        acc (float): teacher-forcing accuracy
+        acc (FloatTensor): `[]`, teacher-forcing accuracy
 
     """
     pad_pred = logits.view(ys_ref.size(0), ys_ref.size(1), logits.size(-1)).argmax(2)
     mask = ys_ref != pad
     numerator = torch.sum(pad_pred.masked_select(mask) == ys_ref.masked_select(mask))
     denominator = torch.sum(mask)
-    acc = float(numerator) * 100 / float(denominator)
+    acc = numerator.float() * 100 / denominator.float()
+    # NOTE: keep on device to avoid a host-device synchronization per step
     return acc
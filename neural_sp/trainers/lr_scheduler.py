@@ -99,9 +99,19 @@ class LRScheduler(object):
     def is_early_stop(self):
         return self.not_improved_n_epochs >= self.early_stop_patient_n_epochs
 
-    def step(self):
+    def step(self, scaler=None):
+        """Update parameters and learning rate.
+
+        Args:
+            scaler (torch.amp.GradScaler): gradient scaler for mixed precision training
+
+        """
         self._step += 1
-        self.optimizer.step()
+        if scaler is not None:
+            scaler.step(self.optimizer)
+            scaler.update()
+        else:
+            self.optimizer.step()
         if self.noam:
             self._noam_lr()
         else:
@@ -188,7 +198,7 @@ class LRScheduler(object):
             optimizer (LRScheduler): optimizer wrapped by LRScheduler class
             remove_old (bool): if True, all checkpoints
                 worse than the top-k ones are deleted
-            amp ():
+            amp (): apex amp or GradScaler for native mixed precision training
             epoch_detail (float): fine-grained epoch (used for MBR training)
 
         """
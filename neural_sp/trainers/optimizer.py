@@ -27,6 +27,25 @@ def set_optimizer(model, optimizer, lr, weight_decay=0.):
     for n in [n for n, p in model.named_parameters() if not p.requires_grad]:
         logger.info("%s" % n)
 
+    # Embeddings with sparse gradients
+    dense_parameters, sparse_parameters = split_sparse_parameters(model)
+    if len(sparse_parameters) > 0:
+        if weight_decay > 0 and optimizer in ['adam', 'sgd', 'momentum', 'nesterov', 'adagrad']:
+            logger.warning('Weight decay is not applied to embeddings with sparse gradients.')
+        if optimizer == 'adam':
+            # NOTE: SparseAdam does not support weight decay
+            return MultipleOptimizer(torch.optim.Adam(dense_parameters,
+                                                      lr=lr,
+                                                      weight_decay=weight_decay),
+                                     torch.optim.SparseAdam(sparse_parameters,
+                                                            lr=lr))
+        elif optimizer in ['sgd', 'momentum', 'nesterov', 'adagrad']:
+            # NOTE: weight decay is not supported for sparse gradients
+            parameters = [{'params': dense_parameters},
+                          {'params': sparse_parameters, 'weight_decay': 0.}]
+        else:
+            raise NotImplementedError('%s does not support sparse gradients.' % optimizer)
+
     if optimizer == 'sgd':
         opt = torch.optim.SGD(parameters,
                               lr=lr,
@@ -80,3 +99,74 @@ def set_optimizer(model, optimizer, lr, weight_decay=0.):
         raise NotImplementedError(optimizer)
 
     return opt
+
+
+def split_sparse_parameters(model):
+    """Split trainable parameters into dense ones and embeddings with sparse gradients.
+
+    Args:
+        model (): model class
+    Returns:
+        dense_parameters (list): parameters with dense gradients
+        sparse_parameters (list): parameters with sparse gradients
+
+    """
+    sparse_parameters = [m.weight for m in model.modules()
+                         if isinstance(m, torch.nn.Embedding) and m.sparse and m.weight.requires_grad]
+    sparse_ids = set(id(p) for p in sparse_parameters)
+    dense_parameters = [p for p in model.parameters() if p.requires_grad and id(p) not in sparse_ids]
+    return dense_parameters, sparse_parameters
+
+
+def rebind_parameters(optimizer, model):
+    """Re-bind parameters of an optimizer restored from a checkpoint to those of the model.
+
+    The restored optimizer holds copies of the parameters, so each parameter group
+    is replaced with the model parameters in the same order as in `set_optimizer`.
+
+    Args:
+        optimizer (torch.optim or MultipleOptimizer): restored optimizer
+        model (): model class
+
+    """
+    if isinstance(optimizer, MultipleOptimizer):
+        dense_parameters, sparse_parameters = split_sparse_parameters(model)
+        optimizer.optimizers[0].param_groups[0]['params'] = dense_parameters
+        optimizer.optimizers[1].param_groups[0]['params'] = sparse_parameters
+    elif len(optimizer.param_groups) == 2:
+        dense_parameters, sparse_parameters = split_sparse_parameters(model)
+        optimizer.param_groups[0]['params'] = dense_parameters
+        optimizer.param_groups[1]['params'] = sparse_parameters
+    else:
+        optimizer.param_groups[0]['params'] = list(model.parameters())
+
+
+class MultipleOptimizer(object):
+    """Wrapper of optimizers for different parameter groups.
+
+    Args:
+        optimizers (torch.optim): optimizers, each of which has its own parameters
+
+    """
+
+    def __init__(self, *optimizers):
+        self.optimizers = optimizers
+
+    @property
+    def param_groups(self):
+        return [g for opt in self.optimizers for g in opt.param_groups]
+
+    def step(self):
+        for opt in self.optimizers:
+            opt.step()
+
+    def zero_grad(self):
+        for opt in self.optimizers:
+            opt.zero_grad()
+
+    def state_dict(self):
+        return [opt.state_dict() for opt in self.optimizers]
+
+    def load_state_dict(self, state_dict):
+        for opt, s in zip(self.optimizers, state_dict):
+            opt.load_state_dict(s)
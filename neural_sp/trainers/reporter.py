@@ -9,6 +9,7 @@ import numpy as np
 from matplotlib import pyplot as plt
 import logging
 import matplotlib
+import torch
 matplotlib.use('Agg')
 
 plt.style.use('ggplot')
@@ -41,6 +42,10 @@ class Reporter(object):
         self.obsv_dev = {'loss': {}, 'acc': {}, 'ppl': {}}
         self.steps = []
 
+        # values received as tensors are converted to scalars when flushed
+        # NOTE: this avoids a host-device synchronization per step
+        self._pending = []  # list of (tensorboard key, value, step, (metric, name))
+
         # report per epoch
         self._epoch = 0
         self.obsv_eval = []
@@ -54,16 +59,20 @@ class Reporter(object):
             is_eval (bool):
 
         """
+        if is_eval:
+            self._flush()
+
         for k, v in observation.items():
             if v is None:
                 continue
             metric, name = k.split('.')
             # NOTE: metric: loss, acc, ppl
 
-            if v == float("inf") or v == -float("inf"):
-                logger.warning("WARNING: received an inf %s for %s." % (metric, k))
-
             if is_eval:
+                v = float(v)
+                if v == float("inf") or v == -float("inf"):
+                    logger.warning("WARNING: received an inf %s for %s." % (metric, k))
+
                 # average for training
                 if name not in self.obsv_train[metric].keys():
                     self.obsv_train[metric][name] = []
@@ -77,14 +86,38 @@ class Reporter(object):
                 logger.info('%s (dev): %.3f' % (k, v))
                 self.add_tensorboard_scalar('dev' + '/' + metric + '/' + name, v)
             else:
+                self._pending.append(('train' + '/' + metric + '/' + name, v, self._step, (metric, name)))
+
+    def _flush(self):
+        """Convert pending values to scalars with a single device-to-host copy."""
+        if len(self._pending) == 0:
+            return
+        values = [v for _, v, _, _ in self._pending]
+        tensor_ids = [i for i, v in enumerate(values) if torch.is_tensor(v)]
+        if len(tensor_ids) > 0:
+            device = values[tensor_ids[0]].device
+            scalars = torch.stack([values[i].detach().float().view(-1)[0].to(device)
+                                   for i in tensor_ids]).tolist()
+            for i, v in zip(tensor_ids, scalars):
+                values[i] = v
+
+        for (key, _, step, obsv_key), v in zip(self._pending, values):
+            if obsv_key is not None:
+                metric, name = obsv_key
+                if v == float("inf") or v == -float("inf"):
+                    logger.warning("WARNING: received an inf %s for %s." % (metric, metric + '.' + name))
                 if name not in self.obsv_train_local[metric].keys():
                     self.obsv_train_local[metric][name] = []
                 self.obsv_train_local[metric][name].append(v)
-                self.add_tensorboard_scalar('train' + '/' + metric + '/' + name, v)
+            self.tf_writer.add_scalar(key, v, step)
+        self._pending = []
 
     def add_tensorboard_scalar(self, key, value):
         """Add scalar value to tensorboard."""
-        self.tf_writer.add_scalar(key, value, self._step)
+        if torch.is_tensor(value):
+            self._pending.append((key, value, self._step, None))
+        else:
+            self.tf_writer.add_scalar(key, value, self._step)
 
     def add_tensorboard_histogram(self, key, value):
         """Add histogram value to tensorboard."""
@@ -94,12 +127,14 @@ class Reporter(object):
         self._step += 1
         if is_eval:
             self.steps.append(self._step)
+            self._flush()
 
             # reset
             self.obsv_train_local = {'loss': {}, 'acc': {}, 'ppl': {}}
 
     def epoch(self, metric=None, name='wer'):
         self._epoch += 1
+        self._flush()
         if metric is None:
             return
         self.epochs.append(self._epoch)
@@ -123,6 +158,11 @@ class Reporter(object):
             os.remove(os.path.join(self.save_path, name + ".png"))
         plt.savefig(os.path.join(self.save_path, name + ".png"))
 
+    def close(self):
+        """Flush pending values and close the tensorboard writer."""
+        self._flush()
+        self.tf_writer.close()
+
     def snapshot(self):
         # linestyles = ['solid', 'dashed', 'dotted', 'dashdotdotted']
         linestyles = ['-', '--', '-.', ':', ':', ':', ':', ':', ':', ':', ':', ':']
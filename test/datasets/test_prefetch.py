@@ -0,0 +1,69 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Test for utility functions for data loader."""
+
+import importlib
+import pytest
+import time
+
+
+class DummyDataLoader(object):
+
+    def __init__(self, n_batches, error=None):
+        self.n_batches = n_batches
+        self.error = error
+        self.n_calls = 0
+
+    def next(self, batch_size=None):
+        if self.error is not None:
+            raise self.error
+        self.n_calls += 1
+        return {'idx': self.n_calls, 'batch_size': batch_size}, self.n_calls == self.n_batches
+
+
+@pytest.mark.parametrize(
+    "n_batches, n_prefetch", [
+        (1, 1),
+        (5, 1),
+        (5, 2),
+        (5, 10),
+    ]
+)
+def test_prefetch(n_batches, n_prefetch):
+    module = importlib.import_module('neural_sp.datasets.utils')
+
+    dataloader = DummyDataLoader(n_batches)
+    batches = list(module.prefetch(dataloader, 4, n_prefetch=n_prefetch))
+    assert [b['idx'] for b, _ in batches] == list(range(1, n_batches + 1))
+    assert [is_new_epoch for _, is_new_epoch in batches] == [False] * (n_batches - 1) + [True]
+    assert all(b['batch_size'] == 4 for b, _ in batches)
+    # the data loader is not advanced into the next epoch
+    assert dataloader.n_calls == n_batches
+
+
+@pytest.mark.parametrize(
+    "error, expected", [
+        (ValueError('dummy'), ValueError),
+        (StopIteration(), RuntimeError),
+    ]
+)
+def test_prefetch_error(error, expected):
+    module = importlib.import_module('neural_sp.datasets.utils')
+
+    with pytest.raises(expected):
+        list(module.prefetch(DummyDataLoader(5, error=error)))
+
+
+def test_prefetch_close():
+    module = importlib.import_module('neural_sp.datasets.utils')
+
+    dataloader = DummyDataLoader(1000)
+    gen = module.prefetch(dataloader, n_prefetch=2)
+    next(gen)
+    gen.close()
+    # the background thread is stopped when the generator is closed
+    n_calls = dataloader.n_calls
+    time.sleep(0.3)
+    assert dataloader.n_calls == n_calls
+    assert n_calls <= 1 + 2 + 1
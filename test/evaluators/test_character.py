@@ -0,0 +1,89 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Test for character-level evaluation."""
+
+import importlib
+import pytest
+
+
+REFS = ['a b c', 'hello world', 'this is a test', 'foo bar', 'x']
+HYPS = ['a b', 'hello word', 'this is the test', 'foo bar baz', 'x']
+
+
+def idx2token(ids):
+    return ''.join([chr(i) for i in ids])
+
+
+class DummyDataLoader(object):
+
+    def __init__(self, batch_size):
+        self.set = 'dev'
+        self.unit = 'char'
+        self.unit_sub1 = None
+        self.corpus = 'dummy'
+        self.idx2token = [idx2token]
+        self.batch_size = batch_size
+        self.offset = 0
+
+    def __len__(self):
+        return len(REFS)
+
+    def reset(self, batch_size=None):
+        self.offset = 0
+
+    def next(self, batch_size=None):
+        indices = list(range(self.offset, min(self.offset + self.batch_size, len(REFS))))
+        self.offset += len(indices)
+        batch = {'xs': [None] * len(indices),
+                 'ys': [[ord(c) for c in REFS[i]] for i in indices],
+                 'utt_ids': ['utt%d' % i for i in indices],
+                 'speakers': ['spk'] * len(indices),
+                 'sessions': ['spk'] * len(indices),
+                 'text': [REFS[i] for i in indices]}
+        return batch, self.offset >= len(REFS)
+
+
+class DummyModel(object):
+
+    def __init__(self, save_path):
+        self.save_path = save_path
+
+    def decode(self, xs, recog_params, idx2token=None, exclude_eos=False,
+               refs_id=None, utt_ids=None, speakers=None, task='ys', ensemble_models=[]):
+        hyps = [HYPS[int(utt_id[3:])] for utt_id in utt_ids]
+        return [[ord(c) for c in hyp] for hyp in hyps], None
+
+    def streamable(self):
+        return True
+
+    def last_success_frame_ratio(self):
+        return 0
+
+    def quantity_rate(self):
+        return 1.0
+
+
+@pytest.mark.parametrize(
+    "batch_size, parallel", [
+        (1, False),
+        (2, False),
+        (2, True),
+        (len(REFS), True),
+    ]
+)
+def test_eval_char(tmp_path, monkeypatch, batch_size, parallel):
+    module = importlib.import_module('neural_sp.evaluators.character')
+    monkeypatch.setattr(module, 'MIN_UTTS_PARALLEL', 0 if parallel else len(REFS) + 1)
+
+    recog_params = {'recog_batch_size': batch_size, 'recog_chunk_sync': False}
+    dataloader = DummyDataLoader(batch_size)
+    wer, cer = module.eval_char([DummyModel(str(tmp_path))], dataloader, recog_params,
+                                epoch=0, recog_dir=str(tmp_path))
+
+    errors = module._compute_errors(REFS, HYPS, compute_word_error=True)
+    assert wer == pytest.approx(errors[0] / errors[4])
+    assert cer == pytest.approx(errors[5] / errors[9])
+
+    with open(str(tmp_path / 'hyp.trn')) as f:
+        assert [line.split(' (')[0] for line in f] == HYPS
@@ -7,9 +7,13 @@ import argparse
 import importlib
 import numpy as np
 import pytest
+import torch
+import types
 
 
 VOCAB = 100  # large for adaptive softmax
+HAS_QUANTIZATION_ENGINE = hasattr(torch.backends, 'quantized') and any(
+    e in torch.backends.quantized.supported_engines for e in ['fbgemm', 'qnnpack'])
 
 
 def make_args(**kwargs):
@@ -31,6 +35,7 @@ def make_args(**kwargs):
         param_init=0.1,
         adaptive_softmax=False,
         tie_embedding=False,
+        sparse_embedding=False,
     )
     args.update(kwargs)
     return argparse.Namespace(**args)
@@ -55,6 +60,7 @@ def make_args(**kwargs):
         # embedding
         ({'adaptive_softmax': True}),
         ({'tie_embedding': True}),
+        ({'sparse_embedding': True}),
     ]
 )
 def test_forward(args):
@@ -72,3 +78,76 @@ def test_forward(args):
     # assert loss.size(0) == 1
     assert loss.item() >= 0
     assert isinstance(observation, dict)
+
+
+@pytest.mark.skipif(not HAS_QUANTIZATION_ENGINE, reason='no quantization engine')
+@pytest.mark.parametrize(
+    "args", [
+        ({'lm_type': 'lstm'}),
+        ({'lm_type': 'gru'}),
+        ({'lm_type': 'lstm', 'tie_embedding': True}),
+        ({'lm_type': 'gru', 'tie_embedding': True}),
+    ]
+)
+def test_quantize_lm(args):
+    args = make_args(**args)
+
+    bs = 4
+
+    module = importlib.import_module('neural_sp.models.lm.rnnlm')
+    lm = module.RNNLM(args)
+    eval_utils = importlib.import_module('neural_sp.bin.eval_utils')
+    lm = eval_utils.quantize_lm(lm)
+    assert not lm.training
+
+    ys = torch.randint(0, VOCAB, (bs, 1), dtype=torch.int64)
+    state = None
+    with torch.no_grad():
+        for t in range(3):
+            lmout, state, log_probs = lm.predict(ys, state)
+            assert log_probs.size() == (bs, 1, VOCAB)
+            assert state['hxs'].size() == (args.n_layers, bs, args.n_units)
+            ys = log_probs.argmax(-1)
+
+
+def test_quantize_lm_unsupported(monkeypatch):
+    module = importlib.import_module('neural_sp.models.lm.rnnlm')
+    lm = module.RNNLM(make_args())
+    eval_utils = importlib.import_module('neural_sp.bin.eval_utils')
+    # torch<1.3 has no torch.backends.quantized
+    monkeypatch.setattr(torch, 'backends', types.SimpleNamespace())
+    with pytest.raises(ValueError, match='requires torch>=1.3'):
+        eval_utils.quantize_lm(lm)
+
+
+@pytest.mark.parametrize(
+    "args", [
+        ({'lm_type': 'lstm', 'n_layers': 1}),
+        ({'lm_type': 'lstm', 'n_layers': 2}),
+        ({'lm_type': 'gru', 'n_layers': 1}),
+        ({'lm_type': 'gru', 'n_layers': 2}),
+        ({'n_units_null_context': 16}),
+        ({'n_projs': 16, 'residual': True}),
+    ]
+)
+def test_fuse_input_embedding(args):
+    args = make_args(**args)
+
+    bs = 4
+    device = "cpu"
+
+    module = importlib.import_module('neural_sp.models.lm.rnnlm')
+    lm = module.RNNLM(args)
+    lm = lm.to(device)
+    lm.eval()
+
+    ys = torch.randint(0, VOCAB, (bs, 5), dtype=torch.int64)
+    state, state_fused = None, None
+    with torch.no_grad():
+        for t in range(ys.size(1)):
+            lm.fuse_embedding = False
+            logits, _, state = lm.decode(ys[:, t:t + 1], state)
+            lm.fuse_input_embedding()
+            logits_fused, _, state_fused = lm.decode(ys[:, t:t + 1], state_fused)
+            assert torch.allclose(logits, logits_fused, atol=1e-6)
+            assert torch.allclose(state['hxs'], state_fused['hxs'], atol=1e-6)
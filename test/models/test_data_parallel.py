@@ -0,0 +1,53 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Test for data parallel gathering."""
+
+import pytest
+import torch
+import torch.nn as nn
+
+
+def make_observations(devices):
+    observations = []
+    for i, device in enumerate(devices):
+        observations.append({
+            'loss.att': torch.tensor(float(i + 1), device=device),
+            'acc.att': float(i + 1) * 10,
+            'loss.ctc': 0,
+            'ppl.att': None,
+        })
+    return observations
+
+
+@pytest.mark.parametrize(
+    "device",
+    ['cpu', -1, torch.device('cpu')]
+)
+def test_average_observations(device):
+    from neural_sp.models.data_parallel import average_observations
+
+    observations = make_observations(['cpu', 'cpu', 'cpu'])
+    observation_avg = average_observations(observations, device)
+
+    assert 'ppl.att' not in observation_avg
+    assert torch.is_tensor(observation_avg['loss.att'])
+    assert observation_avg['loss.att'].device.type == 'cpu'
+    assert observation_avg['loss.att'].item() == pytest.approx(2.0)
+    assert observation_avg['acc.att'] == pytest.approx(20.0)
+    assert observation_avg['loss.ctc'] == 0
+
+
+@pytest.mark.skipif(torch.cuda.device_count() < 2, reason='requires 2 GPUs')
+def test_gather_multi_gpu():
+    from neural_sp.models.data_parallel import CustomDataParallel
+
+    model = CustomDataParallel(nn.Linear(4, 4).cuda(0), device_ids=[0, 1])
+    devices = [torch.device('cuda', 0), torch.device('cuda', 1)]
+    outputs = [(torch.tensor(1.0, device=d), obs)
+               for d, obs in zip(devices, make_observations(devices))]
+    loss, observation_avg = model.gather(outputs, 0)
+
+    assert loss.device == devices[0]
+    assert observation_avg['loss.att'].device == devices[0]
+    assert observation_avg['loss.att'].item() == pytest.approx(1.5)
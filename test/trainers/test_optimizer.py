@@ -0,0 +1,95 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Test for optimizer and checkpoint restoration."""
+
+import argparse
+import importlib
+import numpy as np
+import pytest
+import torch
+
+
+VOCAB = 100
+
+
+def make_args(**kwargs):
+    args = dict(
+        lm_type='lstm',
+        n_units=32,
+        n_projs=0,
+        n_layers=2,
+        residual=False,
+        use_glu=False,
+        n_units_null_context=0,
+        emb_dim=16,
+        vocab=VOCAB,
+        dropout_in=0.1,
+        dropout_hidden=0.1,
+        lsm_prob=0.0,
+        param_init=0.1,
+        adaptive_softmax=False,
+        tie_embedding=False,
+        sparse_embedding=False,
+    )
+    args.update(kwargs)
+    return argparse.Namespace(**args)
+
+
+class ModelWrapper(object):
+    # NOTE: LRScheduler.save_checkpoint expects a (CustomDataParallel) wrapper
+
+    def __init__(self, model):
+        self.module = model
+
+
+def build(args, optimizer):
+    lm_module = importlib.import_module('neural_sp.models.lm.rnnlm')
+    opt_module = importlib.import_module('neural_sp.trainers.optimizer')
+    scheduler_module = importlib.import_module('neural_sp.trainers.lr_scheduler')
+    model = lm_module.RNNLM(args)
+    opt = opt_module.set_optimizer(model, optimizer, lr=0.1, weight_decay=1e-6)
+    scheduler = scheduler_module.LRScheduler(opt, 0.1,
+                                             decay_type='always',
+                                             decay_start_epoch=10,
+                                             decay_rate=0.5)
+    return model, scheduler
+
+
+def train_step(model, scheduler):
+    ys = [np.random.randint(0, VOCAB, ylen).astype(np.int64) for ylen in [4, 5, 3, 7]]
+    scheduler.optimizer.zero_grad()
+    loss = model(ys, state=None)[0]
+    loss.backward()
+    scheduler.step()
+
+
+@pytest.mark.parametrize(
+    "optimizer, sparse_embedding", [
+        ('adam', False),
+        ('sgd', False),
+        ('adam', True),
+        ('sgd', True),
+        ('momentum', True),
+        ('adagrad', True),
+    ]
+)
+def test_resume(tmp_path, optimizer, sparse_embedding):
+    args = make_args(sparse_embedding=sparse_embedding)
+    train_utils = importlib.import_module('neural_sp.bin.train_utils')
+
+    model, scheduler = build(args, optimizer)
+    train_step(model, scheduler)
+    scheduler.save_checkpoint(ModelWrapper(model), str(tmp_path), remove_old=False)
+
+    # Restore into a fresh model
+    model, scheduler = build(args, optimizer)
+    train_utils.load_checkpoint(str(tmp_path / 'model.epoch-0'), model, scheduler)
+
+    param_ids = set(id(p) for g in scheduler.optimizer.param_groups for p in g['params'])
+    assert all(id(p) in param_ids for p in model.parameters())
+
+    params_prev = [p.detach().clone() for p in model.parameters()]
+    train_step(model, scheduler)
+    for (n, p), p_prev in zip(model.named_parameters(), params_prev):
+        assert not torch.equal(p.detach(), p_prev), n
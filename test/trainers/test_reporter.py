@@ -0,0 +1,85 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Test for Reporter."""
+
+import logging
+import pytest
+import torch
+
+
+class RecordingWriter(object):
+
+    def __init__(self):
+        self.scalars = []
+        self.closed = False
+
+    def add_scalar(self, key, value, step):
+        self.scalars.append((key, value, step))
+
+    def close(self):
+        self.closed = True
+
+
+def make_reporter(save_path):
+    from neural_sp.trainers.reporter import Reporter
+
+    reporter = Reporter(str(save_path))
+    reporter.tf_writer.close()
+    reporter.tf_writer = RecordingWriter()
+    return reporter
+
+
+@pytest.mark.parametrize(
+    "observation",
+    [
+        {'loss.att': torch.tensor(1.5), 'acc.att': torch.tensor(0.25)},
+        {'loss.att': 1.5, 'acc.att': torch.tensor(0.25)},
+        {'loss.att': torch.tensor(1.5), 'acc.att': 0.25, 'ppl.att': None},
+    ]
+)
+def test_add(tmp_path, observation):
+    reporter = make_reporter(tmp_path)
+
+    reporter.add(observation)
+    reporter.add_tensorboard_scalar('total_norm', torch.tensor(3.0))
+    reporter.add_tensorboard_scalar('learning_rate', 0.1)
+    reporter.step()
+    # values are deferred until the next print step
+    assert [k for k, _, _ in reporter.tf_writer.scalars] == ['learning_rate']
+
+    reporter.add(observation)
+    reporter.step(is_eval=True)
+    scalars = {(k, step): v for k, v, step in reporter.tf_writer.scalars}
+    for step in [0, 1]:
+        assert isinstance(scalars[('train/loss/att', step)], float)
+        assert scalars[('train/loss/att', step)] == pytest.approx(1.5)
+        assert scalars[('train/acc/att', step)] == pytest.approx(0.25)
+    assert scalars[('total_norm', 0)] == pytest.approx(3.0)
+    assert ('train/ppl/att', 0) not in scalars
+    assert reporter._pending == []
+
+
+def test_close(tmp_path):
+    reporter = make_reporter(tmp_path)
+
+    # steps after the last print step
+    reporter.add({'loss.att': torch.tensor(2.0)})
+    reporter.add_tensorboard_scalar('total_norm', torch.tensor(1.0))
+    reporter.step()
+    reporter.close()
+
+    scalars = {(k, step): v for k, v, step in reporter.tf_writer.scalars}
+    assert scalars[('train/loss/att', 0)] == pytest.approx(2.0)
+    assert scalars[('total_norm', 0)] == pytest.approx(1.0)
+    assert reporter.tf_writer.closed
+
+
+@pytest.mark.parametrize("value", [float('inf'), torch.tensor(float('-inf'))])
+def test_inf_warning(tmp_path, caplog, value):
+    reporter = make_reporter(tmp_path)
+
+    with caplog.at_level(logging.WARNING):
+        reporter.add({'loss.att': value})
+        reporter.step(is_eval=True)
+    assert 'received an inf loss for loss.att' in caplog.text